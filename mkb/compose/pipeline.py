@@ -1,8 +1,6 @@
 import collections
 
-from river import stats
-
-from ..utils import Bar
+from ..utils import Bar, RollingMean
 
 ___all___ = ["Pipeline"]
 
@@ -186,7 +184,7 @@ class Pipeline:
         self.early_stopping_rounds = early_stopping_rounds
         self.device = device
 
-        self.metric_loss = stats.RollingMean(1000)
+        self.metric_loss = RollingMean(1000)
 
         self.round_without_improvement_valid = 0
         self.round_without_improvement_test = 0
@@ -205,20 +203,20 @@ class Pipeline:
 
             for data in bar:
 
-                sample = data["sample"].to(self.device)
+                sample = data["sample"].to(self.device, non_blocking=True)
                 mode = data["mode"]
 
                 score = model(sample)
 
                 if mode == "classification":
 
-                    y = data["y"].to(self.device)
+                    y = data["y"].to(self.device, non_blocking=True)
 
                     error = loss(score, y)
 
                 else:
 
-                    weight = data["weight"].to(self.device)
+                    weight = data["weight"].to(self.device, non_blocking=True)
 
                     negative_sample = sampling.generate(
                         sample=sample,
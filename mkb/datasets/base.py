@@ -18,12 +18,15 @@ class TrainDataset(Dataset):
         mode (str): head-batch or tail-batch or classification. Mode must be set to tail-batch and
             head-batch when using translationnal models such as RotatE, TransE, DistMult, pRotatE,
             ComplEx. Mode must be set to classification when using ConvE.
+        pre_compute (bool): Pre-compute the target matrix of the classification mode. Weights of
+            the head-batch and tail-batch modes are always pre-computed.
         seed (int): Random state.
 
     Attributes:
         n_entity (int): Number of entities.
         n_relation (int): Number of relations.
-        count (dict): Frequency of occurrences of (head, relation) and (relation, tail).
+        weights (torch.Tensor): Weight of each triple computed from the frequencies of
+            (head, relation) and (relation, tail).
         len (int): Number of training triplets.
 
     References:
@@ -41,21 +44,26 @@ class TrainDataset(Dataset):
         self.pre_compute = pre_compute
         self._rng = np.random.RandomState(seed)  # pylint: disable=no-member
 
-        if self.pre_compute and mode == "classification":
+        if mode == "classification":
 
-            self.triples, self.targets = self._pre_compute_classification(
-                triples=triples, n_entity=self.n_entity
-            )
-
-        elif self.pre_compute == True and mode != "classification":
+            # Classification targets are grouped in Python, triples are iterated as a list.
+            if isinstance(triples, np.ndarray):
+                triples = triples.tolist()
 
-            self.triples, self.weights = self._pre_compute(triples=triples)
+            if self.pre_compute:
+                self.triples, self.targets = self._pre_compute_classification(
+                    triples=triples, n_entity=self.n_entity
+                )
+            else:
+                self.triples, self.targets = self._light_test_classification(triples=triples)
 
-        elif not self.pre_compute and mode == "classification":
-            self.triples, self.targets = self._light_test_classification(triples=triples)
         else:
-            self.count = self.get_frequencies(triples)
-            self.triples = triples
+
+            # Weights are counted on a (N, 3) int64 array whatever pre_compute, a float per triple
+            # needs less memory than a dictionary of frequencies.
+            self.triples, self.weights = self._pre_compute(
+                triples=np.asarray(triples, dtype=np.int64).reshape(-1, 3)
+            )
 
         self.len = len(self.triples)
 
@@ -66,19 +74,13 @@ class TrainDataset(Dataset):
         if self.mode == "classification" and self.pre_compute:
             return self.triples[idx], self.targets[idx], self.mode
 
-        elif self.pre_compute:
-            return self.triples[idx], self.weights[idx], self.mode
-
         elif self.mode == "classification" and not self.pre_compute:
             target = torch.zeros(self.n_entity)
             for t in self.targets[idx]:
                 target[t] = 1
             return self.triples[idx], target, self.mode
 
-        elif not self.pre_compute:
-            h, r, t = self.triples[idx]
-            weight = torch.sqrt(1 / torch.Tensor([self.count[(h, r)] + self.count[(t, -r - 1)]]))
-            return torch.LongTensor((h, r, t)), weight, self.mode
+        return self.triples[idx], self.weights[idx], self.mode
 
     @staticmethod
     def collate_fn(data):
@@ -108,17 +110,22 @@ class TrainDataset(Dataset):
 
     @classmethod
     def _pre_compute(cls, triples, start=3):
-        count = cls.get_frequencies(triples=triples)
-
-        train = {}
-        weights = {}
-
-        for idx, (h, r, t) in enumerate(triples):
-            weights[idx] = torch.sqrt(1 / torch.Tensor([count[(h, r)] + count[(t, -r - 1)]]))
+        """Store triples and weights as contiguous tensors, rows are fetched as views. Frequencies
+        of (head, relation) and (tail, relation) pairs are counted on the (N, 3) array of triples.
+        """
+        count = 2 * start
+        n_relation = triples[:, 1].max(initial=0) + 1
+
+        # Each (entity, relation) pair is encoded as a single integer.
+        for entity in (triples[:, 0], triples[:, 2]):
+            _, pair, frequency = np.unique(
+                entity * n_relation + triples[:, 1], return_inverse=True, return_counts=True
+            )
+            count = count + frequency[pair]
 
-            train[idx] = torch.LongTensor((h, r, t))
+        weights = torch.sqrt(1 / torch.from_numpy(count).float()).view(-1, 1)
 
-        return train, weights
+        return torch.from_numpy(triples), weights
 
     @classmethod
     def _light_test_classification(cls, triples):
@@ -128,16 +135,16 @@ class TrainDataset(Dataset):
             set_head_relation[h][r].append(t)
 
         targets = collections.defaultdict(list)
-        train = {}
+        train = []
 
         idx = 0
         for h, hr in set_head_relation.items():
             for r, hrt in hr.items():
+                train.append((h, r))
                 for t in hrt:
-                    train[idx] = torch.LongTensor((h, r))
                     targets[idx].append(t)
                 idx += 1
-        return train, targets
+        return torch.LongTensor(train).view(-1, 2), targets
 
     @classmethod
     def _pre_compute_classification(cls, triples, n_entity):
@@ -148,16 +155,16 @@ class TrainDataset(Dataset):
 
         targets = collections.defaultdict(lambda: torch.zeros(n_entity))
 
-        train = {}
+        train = []
         idx = 0
         for h, hr in set_head_relation.items():
             for r, hrt in hr.items():
+                train.append((h, r))
                 for t in hrt:
-                    train[idx] = torch.LongTensor((h, r))
                     targets[idx][t] = 1.0
                 idx += 1
 
-        return train, targets
+        return torch.LongTensor(train).view(-1, 2), targets
 
 
 class TestDataset(Dataset):
@@ -175,6 +182,9 @@ class TestDataset(Dataset):
         Index of relations.
     mode
         head-batch or tail-batch.
+    filters
+        Index of true triples computed with `TestDataset.get_filters`. Computed from true_triples
+        if not specified. Allows to share the index between multiple test datasets.
 
     References
     ----------
@@ -182,59 +192,55 @@ class TestDataset(Dataset):
     2. [Knowledge Graph Embedding](https://github.com/DeepGraphLearning/KnowledgeGraphEmbedding)
     """
 
-    def __init__(self, triples, true_triples, entities, relations, mode):
+    def __init__(self, triples, true_triples, entities, relations, mode, filters=None):
         self.len = len(triples)
-        self.true_triples = set(true_triples)
         self.triples = triples
         self.n_entity = len(entities.keys())
         self.n_relation = len(relations.keys())
         self.mode = mode
 
-    def __len__(self):
-        return self.len
+        if filters is None:
+            filters = self.get_filters(true_triples=true_triples)
 
-    def __getitem__(self, idx):
-        head, relation, tail = self.triples[idx]
+        self.filters = filters[mode]
 
-        tmp = []
+    def __len__(self):
+        return self.len
 
-        if self.mode == "head-batch":
+    @staticmethod
+    def get_filters(true_triples):
+        """Index true triples by the pair of elements which is fixed for each mode."""
+        filters = {
+            "head-batch": collections.defaultdict(set),
+            "tail-batch": collections.defaultdict(set),
+            "relation-batch": collections.defaultdict(set),
+        }
 
-            for rand_head in range(self.n_entity):
+        for h, r, t in true_triples:
+            filters["head-batch"][(r, t)].add(h)
+            filters["tail-batch"][(h, r)].add(t)
+            filters["relation-batch"][(h, t)].add(r)
 
-                # Candidate answer:
-                if (rand_head, relation, tail) not in self.true_triples:
-                    tmp.append((0, rand_head))
+        return {mode: dict(index) for mode, index in filters.items()}
 
-                # Actual target
-                elif rand_head == head:
-                    tmp.append((0, head))
+    def __getitem__(self, idx):
+        head, relation, tail = self.triples[idx]
 
-                # Actual true triple that we filter out:
-                else:
-                    tmp.append((-1e5, head))
+        if self.mode == "head-batch":
+            target, true_entities = head, self.filters.get((relation, tail), ())
 
         elif self.mode == "tail-batch":
+            target, true_entities = tail, self.filters.get((head, relation), ())
 
-            for rand_tail in range(self.n_entity):
-
-                # Candidate answer:
-                if (head, relation, rand_tail) not in self.true_triples:
-                    tmp.append((0, rand_tail))
-
-                # Actual target
-                elif rand_tail == tail:
-                    tmp.append((0, tail))
+        # Actual true triples that we filter out:
+        filtered = torch.LongTensor([e for e in true_entities if e != target])
 
-                # Actual true triple that we filter out:
-                else:
-                    tmp.append((-1e5, tail))
+        # Candidate answers and actual target:
+        negative_sample = torch.arange(self.n_entity)
+        negative_sample[filtered] = target
 
-        tmp = torch.LongTensor(tmp)
-
-        filter_bias = tmp[:, 0].float()
-
-        negative_sample = tmp[:, 1]
+        filter_bias = torch.zeros(self.n_entity)
+        filter_bias[filtered] = -1e5
 
         sample = torch.LongTensor((head, relation, tail))
 
@@ -272,13 +278,14 @@ class TestDatasetRelation(TestDataset):
 
     """
 
-    def __init__(self, triples, true_triples, entities, relations):
+    def __init__(self, triples, true_triples, entities, relations, filters=None):
         super().__init__(
             triples=triples,
             true_triples=true_triples,
             entities=entities,
             relations=relations,
             mode="relation-batch",
+            filters=filters,
         )
 
     def __getitem__(self, idx):
@@ -289,16 +296,15 @@ class TestDatasetRelation(TestDataset):
         tensor_head = torch.tensor([head] * self.n_relation)
         tensor_tail = torch.tensor([tail] * self.n_relation)
 
-        tmp = torch.LongTensor(
-            [
-                (0, random) if (head, random, tail) not in self.true_triples else (-1, relation)
-                for random in range(self.n_relation)
-            ]
+        filtered = torch.LongTensor(
+            [r for r in self.filters.get((head, tail), ()) if r != relation]
         )
 
-        tensor_relation = tmp[:, 1]
-        filter_bias = tmp[:, 0]
-        filter_bias[relation] = 0
+        tensor_relation = torch.arange(self.n_relation)
+        tensor_relation[filtered] = relation
+
+        filter_bias = torch.zeros(self.n_relation, dtype=torch.long)
+        filter_bias[filtered] = -1
 
         negative_sample = torch.stack([tensor_head, tensor_relation, tensor_tail], dim=-1)
 
@@ -1,6 +1,6 @@
 import pathlib
 
-from ..utils import read_csv, read_json
+from ..utils import load_dataset_bundle
 from .dataset import Dataset
 
 __all__ = ["CountriesS3"]
@@ -16,10 +16,10 @@ class CountriesS3(Dataset):
         batch_size (int): Size of the batch.
         classification (bool): Must be set to True when using ConvE model to optimize BCELoss.
         shuffle (bool): Whether to shuffle the dataset or not.
-        pre_compute (bool): Pre-compute parameters such as weights when using translationnal model
-            (TransE, DistMult, RotatE, pRotatE, ComplEx). When using ConvE, pre-compute target
-            matrix. When pre_compute is set to True, the model training is faster but it needs more
-            memory.
+        pre_compute (bool): Pre-compute the target matrix when using ConvE (classification set
+            to True). When pre_compute is set to True, the model training is faster but it needs
+            more memory. Weights of translationnal models (TransE, DistMult, RotatE, pRotatE,
+            ComplEx) are always pre-computed.
         num_workers (int): Number of workers dedicated to iterate on the dataset.
         seed (int): Random state.
 
@@ -79,15 +79,11 @@ class CountriesS3(Dataset):
         path = pathlib.Path(__file__).parent.joinpath(self.filename)
 
         super().__init__(
-            train=read_csv(file_path=f"{path}/train.csv"),
-            valid=read_csv(file_path=f"{path}/valid.csv"),
-            test=read_csv(file_path=f"{path}/test.csv"),
-            classification=classification,
-            pre_compute=pre_compute,
-            entities=read_json(f"{path}/entities.json"),
-            relations=read_json(f"{path}/relations.json"),
+            **load_dataset_bundle(path, classification=False),
             batch_size=batch_size,
             shuffle=shuffle,
+            classification=classification,
+            pre_compute=pre_compute,
             num_workers=num_workers,
             seed=seed,
         )
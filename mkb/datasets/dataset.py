@@ -1,5 +1,6 @@
-import copy
+import itertools
 
+import numpy as np
 import torch
 from torch.utils import data
 
@@ -31,6 +32,10 @@ class Dataset:
             task.
         classification_valid (dict[str, list]): Test set dedicated to triplet classification
             task.
+        pin_memory (bool): Copy batches into page-locked memory so that transfers to the GPU can
+            run asynchronously. Defaults to True when CUDA is available.
+        persistent_workers (bool): Keep the workers of the train loaders alive between epochs
+            rather than spawning them again. Only used when num_workers > 0, requires torch >= 1.7.
 
     Attributes:
         n_entity (int): Number of entities.
@@ -106,6 +111,8 @@ class Dataset:
         seed=42,
         classification_valid=None,
         classification_test=None,
+        pin_memory=None,
+        persistent_workers=True,
     ):
         self.train = train
         self.valid = valid
@@ -118,33 +125,29 @@ class Dataset:
         self.pre_compute = pre_compute
         self.num_workers = num_workers
         self.seed = seed
+        self.pin_memory = torch.cuda.is_available() if pin_memory is None else pin_memory
+        self.persistent_workers = persistent_workers
 
         # Construct mapping of entities and relations.
         # Each entity and relation as an id.
-        if entities is None:
-            self.entities = self.mapping_entities()
-            self.train = [(self.entities[h], r, self.entities[t]) for h, r, t in self.train]
-
-            if self.valid is not None:
-                self.valid = [(self.entities[h], r, self.entities[t]) for h, r, t in self.valid]
-
-            if self.test is not None:
-                self.test = [(self.entities[h], r, self.entities[t]) for h, r, t in self.test]
+        if entities is None or relations is None:
+            mapping_entities, mapping_relations = self._mappings()
+
+            self.entities = mapping_entities if entities is None else entities
+            self.relations = mapping_relations if relations is None else relations
+
+            self.train, self.valid, self.test = (
+                None
+                if triples is None
+                else self._to_ids(
+                    triples=triples,
+                    entities=mapping_entities if entities is None else None,
+                    relations=mapping_relations if relations is None else None,
+                )
+                for triples in (self.train, self.valid, self.test)
+            )
         else:
             self.entities = entities
-
-        if relations is None:
-
-            self.relations = self.mapping_relations()
-
-            self.train = [(h, self.relations[r], t) for h, r, t in self.train]
-
-            if self.valid is not None:
-                self.valid = [(h, self.relations[r], t) for h, r, t in self.valid]
-
-            if self.test is not None:
-                self.test = [(h, self.relations[r], t) for h, r, t in self.test]
-        else:
             self.relations = relations
 
         # Number of distinct entities and relations.
@@ -159,12 +162,14 @@ class Dataset:
 
             # Needed for mkb to iterate over multiples datasets with single batch each time.
             # __next__ functionnality
-            self.fetch_dataset = self.fetch(self.dataset)
+            self._loaders = itertools.cycle([self.dataset])
 
         # When using TransE, RotatE, DistMult, ComplEx, pRotatE, classification mode must be set
         # to False.
         else:
-            self.step = 0
+            # Training triples as a (N, 3) int64 array shared by the head and tail loaders.
+            self._train_array = np.asarray(self.train, dtype=np.int64).reshape(-1, 3)
+
             self.dataset_head = self.get_train_loader(mode="head-batch")
             self.dataset_tail = self.get_train_loader(mode="tail-batch")
             self.len = int(
@@ -172,10 +177,11 @@ class Dataset:
             )
 
             # Needed for mkb to iterate over multiples datasets with single batch each time.
-            # __next__ functionnality
-            self.step = 0
-            self.fetch_head = self.fetch(self.dataset_head)
-            self.fetch_tail = self.fetch(self.dataset_tail)
+            # __next__ functionnality, tail and head batches are fetched alternately.
+            self._loaders = itertools.cycle([self.dataset_tail, self.dataset_head])
+
+        # Iterator in progress of each loader, restarted when it is exhausted.
+        self._iterators = {}
 
         # Dataset dedicated to triplet classification task. Optionnal.
         self.classification_valid = classification_valid
@@ -194,19 +200,12 @@ class Dataset:
                 yield tail
 
     def __next__(self):
-        if self.classification:
-            return next(self.fetch_dataset)
-        else:
-            self.step += 1
-            if self.step % 2 == 0:
-                return next(self.fetch_head)
-            else:
-                return next(self.fetch_tail)
-
-    @staticmethod
-    def fetch(dataloader):
-        while True:
-            yield from dataloader
+        loader = next(self._loaders)
+        try:
+            return next(self._iterators[loader])
+        except (KeyError, StopIteration):
+            self._iterators[loader] = iter(loader)
+            return next(self._iterators[loader])
 
     def __len__(self):
         return self.len
@@ -214,7 +213,8 @@ class Dataset:
     @property
     def true_triples(self):
         """Get all true triples from the dataset."""
-        true_triples = copy.deepcopy(self.train)
+        # Triples are immutable tuples, a shallow copy protects the train set from the additions.
+        true_triples = list(self.train)
 
         if self.valid is not None:
             true_triples += self.valid
@@ -268,12 +268,14 @@ class Dataset:
         return self.test_stream(triples=self.valid, batch_size=batch_size)
 
     def test_stream(self, triples, batch_size):
+        filters = TestDataset.get_filters(true_triples=self.train + self.test + self.valid)
+
         head_loader = self._get_test_loader(
-            triples=triples, batch_size=batch_size, mode="head-batch"
+            triples=triples, batch_size=batch_size, mode="head-batch", filters=filters
         )
 
         tail_loader = self._get_test_loader(
-            triples=triples, batch_size=batch_size, mode="tail-batch"
+            triples=triples, batch_size=batch_size, mode="tail-batch", filters=filters
         )
 
         return [head_loader, tail_loader]
@@ -281,7 +283,7 @@ class Dataset:
     def get_train_loader(self, mode):
         """Initialize train dataset loader."""
         dataset = TrainDataset(
-            triples=self.train,
+            triples=self.train if mode == "classification" else self._train_array,
             entities=self.entities,
             relations=self.relations,
             mode=mode,
@@ -294,22 +296,31 @@ class Dataset:
         else:
             collate_fn = TrainDataset.collate_fn
 
+        # The persistent_workers keyword requires torch >= 1.7, it is only passed with workers.
+        kwargs = {}
+        if self.persistent_workers and self.num_workers > 0:
+            kwargs["persistent_workers"] = True
+
         return data.DataLoader(
             dataset=dataset,
             batch_size=self.batch_size,
             shuffle=self.shuffle,
             num_workers=self.num_workers,
             collate_fn=collate_fn,
+            pin_memory=self.pin_memory,
+            **kwargs,
         )
 
-    def _get_test_loader(self, triples, batch_size, mode):
+    def _get_test_loader(self, triples, batch_size, mode, filters=None):
         """Initialize test dataset loader."""
+        # True triples are only needed to build the filters when they are not shared.
         test_dataset = TestDataset(
             triples=triples,
-            true_triples=self.train + self.test + self.valid,
+            true_triples=self.train + self.test + self.valid if filters is None else None,
             entities=self.entities,
             relations=self.relations,
             mode=mode,
+            filters=filters,
         )
 
         return data.DataLoader(
@@ -317,19 +328,43 @@ class Dataset:
             batch_size=batch_size,
             num_workers=self.num_workers,
             collate_fn=TestDataset.collate_fn,
+            pin_memory=self.pin_memory,
         )
 
     def mapping_entities(self):
         """Construct mapping entities."""
-        return {
-            e: i
-            for i, e in enumerate(
-                dict.fromkeys(
-                    [h for h, _, _ in self.true_triples] + [t for _, _, t in self.true_triples]
-                )
-            )
-        }
+        return self._mappings()[0]
 
     def mapping_relations(self):
         """Construct mapping relations."""
-        return {r: i for i, r in enumerate(dict.fromkeys([r for _, r, _ in self.true_triples]))}
+        return self._mappings()[1]
+
+    def _mappings(self):
+        """Construct mapping of entities and relations with a single pass over the triples. Heads
+        are indexed first, then tails, in order of appearance."""
+        heads, relations, tails = {}, {}, {}
+
+        for triples in (self.train, self.valid, self.test):
+            if triples is None:
+                continue
+            for h, r, t in triples:
+                heads[h] = None
+                relations[r] = None
+                tails[t] = None
+
+        heads.update(tails)
+
+        return (
+            {e: i for i, e in enumerate(heads)},
+            {r: i for i, r in enumerate(relations)},
+        )
+
+    @staticmethod
+    def _to_ids(triples, entities, relations):
+        """Convert labels of triples to ids. Entities or relations are left unchanged when their
+        mapping is None."""
+        if relations is None:
+            return [(entities[h], r, entities[t]) for h, r, t in triples]
+        if entities is None:
+            return [(h, relations[r], t) for h, r, t in triples]
+        return [(entities[h], relations[r], entities[t]) for h, r, t in triples]
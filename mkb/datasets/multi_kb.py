@@ -1,4 +1,3 @@
-import copy
 import random
 
 import numpy as np
@@ -85,6 +84,8 @@ class MultiKb(Dataset):
             classification=dataset.classification,
             classification_valid=dataset.classification_valid,
             classification_test=dataset.classification_test,
+            pin_memory=dataset.pin_memory,
+            persistent_workers=dataset.persistent_workers,
         )
 
     @property
@@ -132,37 +133,38 @@ class MultiKb(Dataset):
         """
         Split train into n_part. Returns selected part and excluded triples.
         """
-        splitted_train = []
+        triples = np.asarray(train, dtype=np.int64).reshape(-1, 3)
 
-        train = copy.deepcopy(train)
+        # Shuffling a list of positions draws the same permutation as shuffling the triples.
+        order = list(range(len(triples)))
+        random.Random(seed).shuffle(order)
+        triples = triples[order]
 
-        random.Random(seed).shuffle(train)
+        # Parts have the same sizes as the ones of np.array_split.
+        size, remainder = divmod(len(triples), n_part)
+        part = np.repeat(np.arange(n_part), [size + 1] * remainder + [size] * (n_part - remainder))
+        selected = np.isin(part, id_set)
 
-        excluded_triples = []
-
-        for i, frame in enumerate(np.array_split(train, n_part)):
-
-            if i in id_set:
-                splitted_train += cls.format_triples(frame)
-            else:
-                excluded_triples += cls.format_triples(frame)
-
-        return splitted_train, excluded_triples
+        return cls.format_triples(triples[selected]), cls.format_triples(triples[~selected])
 
     @staticmethod
     def format_triples(x):
-        return [(h, r, t) for h, r, t in x]
+        return list(zip(*x.T.tolist()))
 
     def corrupt_entities(self, entities, seed):
         n_entities = len(entities)
         n_entities_to_corrupt = round(n_entities * (1 - self.aligned_entities))
-        rng = np.random.RandomState(seed)
-        entities_id_corrupt = rng.choice(range(n_entities), n_entities_to_corrupt, replace=False)
+        rng = np.random.default_rng(seed)
+        entities_id_corrupt = rng.choice(
+            n_entities, size=n_entities_to_corrupt, replace=False, shuffle=False
+        )
+
+        # Labels indexed by id, the mapping is rebuilt in id order.
+        names = [None] * n_entities
+        for e, id_e in entities.items():
+            names[id_e] = e
 
-        e_prime = {value: key for key, value in entities.items()}
         for id_e in entities_id_corrupt:
-            e = e_prime[id_e]
-            entities.pop(e)
-            entities[f"{e}_{self.id_set}_{self.n_part}"] = id_e
-        entities = {k: v for k, v in sorted(entities.items(), key=lambda item: item[1])}
-        return entities
+            names[id_e] = f"{names[id_e]}_{self.id_set}_{self.n_part}"
+
+        return {e: id_e for id_e, e in enumerate(names)}
@@ -35,7 +35,7 @@ class Semanlink(Dataset):
     batch_size
         Size of the batch.
     pre_compute
-        Pre-compute parameters such as weights.
+        Pre-compute the target matrix of the classification mode. Weights are always pre-computed.
     num_workers
         Number of workers dedicated to iterate on the dataset.
     seed
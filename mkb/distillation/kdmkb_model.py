@@ -4,12 +4,11 @@ import os
 import numpy as np
 import pandas as pd
 import torch
-from river import stats
 
 from ..evaluation import Evaluation
 from ..losses import Adversarial, BCEWithLogitsLoss
 from ..sampling import NegativeSampling
-from ..utils import BarRange
+from ..utils import BarRange, RollingMean
 from .distillation import Distillation
 from .top_k_sampling import FastTopKSampling
 
@@ -243,7 +242,7 @@ class KdmkbModel:
                 device=device,
             )
 
-        self.metrics = {id_dataset: stats.RollingMean(1000) for id_dataset, _ in datasets.items()}
+        self.metrics = {id_dataset: RollingMean(1000) for id_dataset, _ in datasets.items()}
 
     @classmethod
     def _init_distillation(
@@ -292,7 +291,7 @@ class KdmkbModel:
 
             data = next(dataset)
 
-            sample = data["sample"].to(self.device)
+            sample = data["sample"].to(self.device, non_blocking=True)
 
             mode = data["mode"]
 
@@ -300,7 +299,7 @@ class KdmkbModel:
 
             if mode == "classification":
 
-                y = data["y"].to(self.device)
+                y = data["y"].to(self.device, non_blocking=True)
 
                 loss_models[id_dataset] = self.loss_function[id_dataset](scores, y) * (
                     1 - weight_kl[id_dataset]
@@ -315,7 +314,7 @@ class KdmkbModel:
                     mode=mode,
                 )
 
-                weight = data["weight"].to(self.device)
+                weight = data["weight"].to(self.device, non_blocking=True)
                 negative_sample = negative_sample.to(self.device)
 
                 negative_score = models[id_dataset](sample, negative_sample, mode=mode)
@@ -664,17 +664,15 @@ class TopKSampling:
     @classmethod
     def _get_rank_relations(cls, teacher, sample, batch_size, device):
         with torch.no_grad():
-            return torch.argsort(teacher(sample.to(device)), descending=True, dim=0).flatten()[
-                :batch_size
-            ]
+            score = teacher(sample.to(device)).flatten()
+            return torch.topk(score, k=min(batch_size, score.size(0))).indices
 
     @classmethod
     def _get_rank_entities(cls, teacher, sample, entities, mode, batch_size, device):
         """Speed up computation of best candidates entities using negative sample mechanism."""
         with torch.no_grad():
-            return torch.argsort(
-                teacher(sample.to(device), entities.to(device), mode), dim=1, descending=True
-            )[:, 0:batch_size].flatten()
+            score = teacher(sample.to(device), entities.to(device), mode)
+            return torch.topk(score, k=min(batch_size, score.size(1)), dim=1).indices.flatten()
 
 
 class TopKSamplingTransE:
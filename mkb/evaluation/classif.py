@@ -1,4 +1,3 @@
-import numpy as np
 import torch
 
 from ..utils import make_prediction
@@ -67,6 +66,29 @@ def accuracy(model, X, y, threshold, batch_size, num_workers=1, device="cuda"):
 
 
     """
+    y_pred, y_true = _scores_labels(
+        model=model, X=X, y=y, batch_size=batch_size, num_workers=num_workers, device=device
+    )
+
+    return _accuracy(
+        y_true=y_true,
+        y_pred=y_pred,
+        threshold=threshold,
+    )
+
+
+def find_threshold(model, X, y, batch_size, num_workers=1, device="cuda"):
+    """Find the best treshold according to input model and dataset."""
+    y_pred, y_true = _scores_labels(
+        model=model, X=X, y=y, batch_size=batch_size, num_workers=num_workers, device=device
+    )
+
+    return _best_threshold(y_pred=y_pred, y_true=y_true)
+
+
+def _scores_labels(model, X, y, batch_size, num_workers, device):
+    """Score triplets. Returns scores and labels as two parallel tensors stored on the device used
+    for the predictions, labels are set to True for existing triplets."""
     with torch.no_grad():
 
         y_pred = make_prediction(
@@ -77,51 +99,82 @@ def accuracy(model, X, y, threshold, batch_size, num_workers=1, device="cuda"):
             device=device,
         )
 
-        y_pred = y_pred.cpu().numpy()
+    return y_pred, torch.as_tensor(y, device=y_pred.device) > 0
 
-        return _accuracy(
-            y_true=y,
-            y_pred=y_pred,
-            threshold=threshold,
-        )
 
+def _best_threshold(y_pred, y_true):
+    """Find the threshold which maximizes the difference between the true positive rate and the
+    false positive rate. Scores are sorted once and every distinct score is evaluated as a
+    candidate threshold with cumulative counts of positive and negative triplets. The sweep runs
+    on the device which stores the scores.
 
-def find_threshold(model, X, y, batch_size, num_workers=1, device="cuda"):
-    """Find the best treshold according to input model and dataset.
+    Example:
+
+        >>> import numpy as np
+
+        >>> y_true = np.array([-1, -1, -1, -1, -1, 1, 1, 1, 1, 1])
+        >>> y_pred = np.array([1, 2, 3, 4, 5, 5, 6, 7, 8, 9])
 
-    >>> from sklearn import metrics
+        >>> _best_threshold(y_pred = y_pred, y_true = y_true)
+        6
 
-    >>> y_true = [-1, -1, -1, -1, -1, 1, 1, 1, 1, 1]
-    >>> y_pred = [1, 2, 3, 4, 5, 5, 6, 7, 8, 9]
+        Every triplet is predicted as negative when no threshold does better than chance.
 
-    >>> false_positive_rates, true_positive_rates, tresholds = metrics.roc_curve(
-    ...    y_true=y_true,
-    ...    y_score=y_pred
-    ... )
+        >>> _best_threshold(y_pred = np.array([0., 1.]), y_true = np.array([1, -1]))
+        inf
 
-    >>> tresholds[np.argmax(true_positive_rates - false_positive_rates)]
-    6
+        >>> _best_threshold(y_pred = np.array([0., 1.]), y_true = np.array([1, 1]))
+        inf
 
     """
-    from sklearn import metrics
+    y_pred = torch.as_tensor(y_pred)
+    positive = torch.as_tensor(y_true, device=y_pred.device) > 0
+
+    # Counts are only read at the last position of each distinct score, the order of tied scores
+    # does not matter and an unstable sort is enough.
+    y_pred, order = torch.sort(y_pred, descending=True)
+    positive = positive[order]
+
+    # Last position of each distinct score, scores being sorted in descending order.
+    candidates = torch.cat(
+        [
+            torch.nonzero(y_pred[1:] != y_pred[:-1]).flatten(),
+            torch.tensor([len(y_pred) - 1], device=y_pred.device),
+        ]
+    )
 
-    with torch.no_grad():
+    true_positives = torch.cumsum(positive, dim=0, dtype=torch.float64)[candidates]
+    false_positives = candidates + 1 - true_positives
 
-        y_pred = make_prediction(
-            model=model,
-            dataset=X,
-            batch_size=batch_size,
-            num_workers=num_workers,
-            device=device,
+    # Like roc_curve, candidates aligned with their two neighbours on the ROC curve are dropped.
+    # Ties between the remaining candidates are then broken the same way.
+    if len(candidates) > 2:
+        keep = torch.ones(len(candidates), dtype=torch.bool, device=y_pred.device)
+        keep[1:-1] = (true_positives[2:] - 2 * true_positives[1:-1] + true_positives[:-2] != 0) | (
+            false_positives[2:] - 2 * false_positives[1:-1] + false_positives[:-2] != 0
         )
+        candidates = candidates[keep]
+        true_positives = true_positives[keep]
+        false_positives = false_positives[keep]
 
-        y_pred = y_pred.cpu().numpy()
+    # An infinite threshold predicts every triplet as negative, with no true or false positive.
+    zero = torch.zeros(1, dtype=torch.float64, device=y_pred.device)
+    true_positives = torch.cat([zero, true_positives])
+    false_positives = torch.cat([zero, false_positives])
 
-    false_positive_rates, true_positive_rates, tresholds = metrics.roc_curve(
-        y_true=y, y_score=y_pred
-    )
+    # Rates are undefined with a single class, every triplet is then predicted as negative.
+    if true_positives[-1] == 0 or false_positives[-1] == 0:
+        return float("inf")
 
-    return tresholds[np.argmax(true_positive_rates - false_positive_rates)]
+    true_positive_rates = true_positives / true_positives[-1]
+    false_positive_rates = false_positives / false_positives[-1]
+
+    best = torch.argmax(true_positive_rates - false_positive_rates).item()
+
+    if best == 0:
+        return float("inf")
+
+    return y_pred[candidates[best - 1]].cpu().numpy()[()]
 
 
 def _accuracy(y_pred, y_true, threshold):
@@ -140,16 +193,8 @@ def _accuracy(y_pred, y_true, threshold):
         0.9
 
     """
-    accuracy = 0
-
-    for i in range(len(y_pred)):
-
-        if y_pred[i] >= threshold and y_true[i] > 0:
-
-            accuracy += 1
-
-        if y_pred[i] < threshold and y_true[i] <= 0:
-
-            accuracy += 1
+    y_pred = torch.as_tensor(y_pred).double()
+    positive = torch.as_tensor(y_true, device=y_pred.device) > 0
 
-    return accuracy / len(y_pred)
+    # A triplet is well classified when its predicted label matches the true one.
+    return ((y_pred >= threshold) == positive).sum().item() / len(y_pred)
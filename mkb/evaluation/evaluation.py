@@ -2,7 +2,6 @@ import collections
 
 import pandas as pd
 import torch
-from river import stats
 from torch.utils import data
 
 from ..datasets import base
@@ -144,20 +143,44 @@ class Evaluation:
         self.device = device
         self.num_workers = num_workers
 
-    def _get_test_loader(self, triples, mode):
-        test_dataset = base.TestDataset(
+        # Page-locked batches allow asynchronous copies to the GPU.
+        self.pin_memory = str(device).startswith("cuda")
+
+    @property
+    def true_triples(self):
+        return self._true_triples
+
+    @true_triples.setter
+    def true_triples(self, true_triples):
+        # Filters are computed again from the new true triples.
+        self._true_triples = true_triples
+        self._filters = None
+
+    @property
+    def filters(self):
+        """Index of the true triples shared by every test dataset. Computed once per assignment of
+        true_triples."""
+        if self._filters is None:
+            self._filters = base.TestDataset.get_filters(true_triples=self.true_triples)
+        return self._filters
+
+    def _get_test_dataset(self, triples, mode):
+        return base.TestDataset(
             triples=triples,
             true_triples=self.true_triples,
             entities=self.entities,
             relations=self.relations,
             mode=mode,
+            filters=self.filters,
         )
 
+    def _get_test_loader(self, triples, mode):
         return data.DataLoader(
-            dataset=test_dataset,
+            dataset=self._get_test_dataset(triples=triples, mode=mode),
             batch_size=self.batch_size,
             num_workers=self.num_workers,
             collate_fn=base.TestDataset.collate_fn,
+            pin_memory=self.pin_memory,
         )
 
     def get_entity_stream(self, dataset):
@@ -166,6 +189,32 @@ class Evaluation:
         tail_loader = self._get_test_loader(triples=dataset, mode="tail-batch")
         return [head_loader, tail_loader]
 
+    def _get_entity_loader(self, dataset):
+        """Single loader dedicated to link prediction used by eval and detail_eval. Head-batch and
+        tail-batch samples are iterated with a single pool of workers, each batch gathers samples
+        of a single mode."""
+        test_datasets = [
+            self._get_test_dataset(triples=dataset, mode="head-batch"),
+            self._get_test_dataset(triples=dataset, mode="tail-batch"),
+        ]
+
+        batches, offset = [], 0
+        for test_dataset in test_datasets:
+            end = offset + len(test_dataset)
+            batches += [
+                list(range(start, min(start + self.batch_size, end)))
+                for start in range(offset, end, self.batch_size)
+            ]
+            offset = end
+
+        return data.DataLoader(
+            dataset=data.ConcatDataset(test_datasets),
+            batch_sampler=batches,
+            num_workers=self.num_workers,
+            collate_fn=base.TestDataset.collate_fn,
+            pin_memory=self.pin_memory,
+        )
+
     def get_relation_stream(self, dataset):
         """Get stream dedicated to relation prediction."""
         test_dataset = base.TestDatasetRelation(
@@ -173,6 +222,7 @@ class Evaluation:
             true_triples=self.true_triples,
             entities=self.entities,
             relations=self.relations,
+            filters=self.filters,
         )
 
         return data.DataLoader(
@@ -180,28 +230,26 @@ class Evaluation:
             batch_size=self.batch_size,
             num_workers=self.num_workers,
             collate_fn=base.TestDatasetRelation.collate_fn,
+            pin_memory=self.pin_memory,
         )
 
     def eval(self, model, dataset):
         """Evaluate selected model with the metrics: MRR, MR, HITS@1, HITS@3, HITS@10"""
-        metrics = collections.OrderedDict(
-            {metric: stats.Mean() for metric in ["MRR", "MR", "HITS@1", "HITS@3", "HITS@10"]}
-        )
+        metrics = self._init_metrics()
 
         with torch.no_grad():
 
-            for test_set in self.get_entity_stream(dataset):
-
-                metrics = self.compute_score(
-                    model=model, test_set=test_set, metrics=metrics, device=self.device
-                )
+            metrics = self.compute_score(
+                model=model,
+                test_set=self._get_entity_loader(dataset),
+                metrics=metrics,
+                device=self.device,
+            )
 
-        return {name: round(metric.get(), 4) for name, metric in metrics.items()}
+        return dict(self._get_metrics(metrics))
 
     def eval_relations(self, model, dataset):
-        metrics = collections.OrderedDict(
-            {f"{metric}": stats.Mean() for metric in ["MRR", "MR", "HITS@1", "HITS@3", "HITS@10"]}
-        )
+        metrics = self._init_metrics()
 
         with torch.no_grad():
 
@@ -212,7 +260,7 @@ class Evaluation:
                 device=self.device,
             )
 
-        return {f"{name}_relations": round(metric.get(), 4) for name, metric in metrics.items()}
+        return {f"{name}_relations": value for name, value in self._get_metrics(metrics).items()}
 
     @classmethod
     def compute_score(cls, model, test_set, metrics, device):
@@ -222,14 +270,16 @@ class Evaluation:
             model = model.eval()
             training = True
 
+        device = torch.device(device)
+
         bar = Bar(dataset=test_set, update_every=1)
         bar.set_description("Evaluation")
 
         for data in bar:
 
-            sample = data["sample"].to(device)
-            negative_sample = data["negative_sample"].to(device)
-            filter_bias = data["filter_bias"].to(device)
+            sample = cls._to_device(data["sample"], device)
+            negative_sample = cls._to_device(data["negative_sample"], device)
+            filter_bias = cls._to_device(data["filter_bias"], device)
             mode = data["mode"]
 
             if mode == "head-batch" or mode == "tail-batch":
@@ -242,8 +292,6 @@ class Evaluation:
 
             score += filter_bias
 
-            argsort = torch.argsort(score, dim=1, descending=True)
-
             if mode == "head-batch":
                 positive_arg = sample[:, 0]
 
@@ -253,25 +301,9 @@ class Evaluation:
             elif mode == "tail-batch":
                 positive_arg = sample[:, 2]
 
-            batch_size = sample.size(0)
-
-            for i in range(batch_size):
-                # Notice that argsort is not ranking
-                ranking = (argsort[i, :] == positive_arg[i]).nonzero()
-                assert ranking.size(0) == 1
-
-                ranking = 1 + ranking.item()
+            ranking = cls._ranking(score=score, positive_arg=positive_arg)
 
-                # ranking + 1 is the true ranking used in evaluation metrics
-                metrics["MRR"].update(1.0 / ranking)
-
-                metrics["MR"].update(ranking)
-
-                metrics["HITS@1"].update(1.0 if ranking <= 1 else 0.0)
-
-                metrics["HITS@3"].update(1.0 if ranking <= 3 else 0.0)
-
-                metrics["HITS@10"].update(1.0 if ranking <= 10 else 0.0)
+            metrics = cls._update_metrics(metrics=metrics, ranking=ranking)
 
         if training:
             model = model.train()
@@ -286,14 +318,16 @@ class Evaluation:
             model = model.eval()
             training = True
 
+        device = torch.device(device)
+
         bar = Bar(dataset=test_set, update_every=1)
         bar.set_description("Evaluation")
 
         for data in bar:
 
-            sample = data["sample"].to(device)
-            negative_sample = data["negative_sample"].to(device)
-            filter_bias = data["filter_bias"].to(device)
+            sample = cls._to_device(data["sample"], device)
+            negative_sample = cls._to_device(data["negative_sample"], device)
+            filter_bias = cls._to_device(data["filter_bias"], device)
             mode = data["mode"]
 
             score = model(
@@ -304,41 +338,104 @@ class Evaluation:
 
             score += filter_bias
 
-            argsort = torch.argsort(score, dim=1, descending=True)
-
             if mode == "head-batch":
                 positive_arg = sample[:, 0]
 
             elif mode == "tail-batch":
                 positive_arg = sample[:, 2]
 
-            batch_size = sample.size(0)
+            ranking = cls._ranking(score=score, positive_arg=positive_arg)
 
-            for i in range(batch_size):
-                # Notice that argsort is not ranking
-                ranking = (argsort[i, :] == positive_arg[i]).nonzero()
-                assert ranking.size(0) == 1
+            batch_types = [types_relations[relation] for relation in sample[:, 1].tolist()]
 
-                ranking = 1 + ranking.item()
+            for type_relation in set(batch_types):
 
-                type_relation = types_relations[sample[:, 1][i].item()]
+                mask = torch.tensor(
+                    [type_relation == batch_type for batch_type in batch_types],
+                    device=ranking.device,
+                )
 
-                # ranking + 1 is the true ranking used in evaluation metrics
-                metrics[mode][type_relation]["MRR"].update(1.0 / ranking)
+                metrics[mode][type_relation] = cls._update_metrics(
+                    metrics=metrics[mode][type_relation], ranking=ranking[mask]
+                )
+
+        if training:
+            model = model.train()
 
-                metrics[mode][type_relation]["MR"].update(ranking)
+        return metrics
 
-                metrics[mode][type_relation]["HITS@1"].update(1.0 if ranking <= 1 else 0.0)
+    @staticmethod
+    def _to_device(tensor, device):
+        """Move the tensor to the device unless it already lives there."""
+        if tensor.device == device:
+            return tensor
+        return tensor.to(device, non_blocking=True)
 
-                metrics[mode][type_relation]["HITS@3"].update(1.0 if ranking <= 3 else 0.0)
+    @staticmethod
+    def _ranking(score, positive_arg):
+        """Rank of the positive entity for each sample of the batch, there is no need to sort the
+        scores. The rank is 1 + the number of candidates that score strictly higher than the
+        positive one. Candidates tied with the positive one are ranked on average behind it: each
+        tie adds 0.5 to the rank, so that low precision scores do not inflate MRR and HITS@k.
 
-                metrics[mode][type_relation]["HITS@10"].update(1.0 if ranking <= 10 else 0.0)
+        Example:
 
-        if training:
-            model = model.train()
+            >>> import torch
+
+            >>> from mkb import evaluation
+
+            >>> score = torch.tensor([[3., 1., 2., 2.], [1., 1., 1., 1.]])
+
+            >>> evaluation.Evaluation._ranking(score=score, positive_arg=torch.tensor([2, 0]))
+            tensor([2.5000, 2.5000])
+
+        """
+        positive_score = score.gather(1, positive_arg.unsqueeze(1))
+
+        higher = (score > positive_score).sum(dim=1).float()
+
+        # The positive entity is tied with itself.
+        ties = (score == positive_score).sum(dim=1).float() - 1
+
+        return 1.0 + higher + ties / 2
 
+    @staticmethod
+    def _init_metrics():
+        """Sums of the metrics and number of rankings they gather."""
+        metrics = collections.OrderedDict({"count": 0})
+        for metric in ["MRR", "MR", "HITS@1", "HITS@3", "HITS@10"]:
+            metrics[metric] = 0.0
         return metrics
 
+    @staticmethod
+    def _update_metrics(metrics, ranking):
+        """Update metrics with the rankings of a whole batch."""
+        metrics["count"] += ranking.size(0)
+
+        # HITS@1, HITS@3 and HITS@10 are computed with a single broadcasted comparison.
+        hits = ranking.unsqueeze(1) <= ranking.new_tensor([1, 3, 10])
+
+        sums = torch.cat(
+            [(1.0 / ranking).sum().view(1), ranking.sum().view(1), hits.sum(dim=0).float()]
+        ).tolist()
+
+        for metric, value in zip(["MRR", "MR", "HITS@1", "HITS@3", "HITS@10"], sums):
+            metrics[metric] += value
+
+        return metrics
+
+    @staticmethod
+    def _get_metrics(metrics):
+        """Average the sums of the metrics."""
+        count = max(metrics["count"], 1)
+        return collections.OrderedDict(
+            {
+                metric: round(value / count, 4)
+                for metric, value in metrics.items()
+                if metric != "count"
+            }
+        )
+
     def types_relations(self, model, dataset, threshold=1.5):
         """
         Divide input dataset relations into different categories (i.e. ONE-TO-ONE, ONE-TO-MANY,
@@ -409,31 +506,21 @@ class Evaluation:
 
             for type_relation in types_relations:
 
-                metrics[mode][type_relation] = collections.OrderedDict(
-                    {
-                        f"{metric}": stats.Mean()
-                        for metric in ["MRR", "MR", "HITS@1", "HITS@3", "HITS@10"]
-                    }
-                )
+                metrics[mode][type_relation] = self._init_metrics()
 
         with torch.no_grad():
 
-            for test_set in self.get_entity_stream(dataset):
-
-                metrics = self.compute_detailled_score(
-                    model=model,
-                    test_set=test_set,
-                    metrics=metrics,
-                    types_relations=mapping_type_relations,
-                    device=self.device,
-                )
+            metrics = self.compute_detailled_score(
+                model=model,
+                test_set=self._get_entity_loader(dataset),
+                metrics=metrics,
+                types_relations=mapping_type_relations,
+                device=self.device,
+            )
 
         for mode in ["head-batch", "tail-batch"]:
             for type_relation in types_relations:
-                for metric in ["MRR", "MR", "HITS@1", "HITS@3", "HITS@10"]:
-                    metrics[mode][type_relation][metric] = round(
-                        metrics[mode][type_relation][metric].get(), 4
-                    )
+                metrics[mode][type_relation] = self._get_metrics(metrics[mode][type_relation])
 
         results = pd.DataFrame(metrics)
 
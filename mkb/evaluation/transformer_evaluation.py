@@ -1,14 +1,11 @@
 import torch
 import tqdm
-from torch.utils import data
 
-from ..datasets.base import TestDataset
 from ..models.complex import ComplEx
 from ..models.distmult import DistMult
 from ..models.protate import pRotatE
 from ..models.rotate import RotatE
 from ..models.transe import TransE
-from ..utils import Bar
 from .evaluation import Evaluation
 
 __all__ = ["Transformer"]
@@ -158,163 +155,3 @@ class TransformerEvaluation(Evaluation):
             dataset=dataset,
             threshold=threshold,
         )
-
-    def _get_test_loader(self, triples, true_triples, entities, relations, mode):
-        test_dataset = TestDataset(
-            triples=triples,
-            true_triples=true_triples,
-            entities=entities,
-            relations=relations,
-            mode=mode,
-        )
-
-        return data.DataLoader(
-            dataset=test_dataset,
-            batch_size=self.batch_size,
-            num_workers=self.num_workers,
-            collate_fn=TestDataset.collate_fn,
-        )
-
-    def get_entity_stream(self, dataset):
-        """Get stream dedicated to link prediction."""
-
-        head_loader = self._get_test_loader(
-            triples=dataset,
-            true_triples=self.true_triples,
-            entities=self.entities,
-            relations=self.relations,
-            mode="head-batch",
-        )
-
-        tail_loader = self._get_test_loader(
-            triples=dataset,
-            true_triples=self.true_triples,
-            entities=self.entities,
-            relations=self.relations,
-            mode="tail-batch",
-        )
-
-        return [head_loader, tail_loader]
-
-    def compute_score(self, model, test_set, metrics, device):
-
-        training = False
-        if model.training:
-            model = model.eval()
-            training = True
-
-        bar = Bar(dataset=test_set, update_every=1)
-        bar.set_description("Evaluation")
-
-        for data in bar:
-
-            sample = data["sample"].to(device)
-            negative_sample = data["negative_sample"].to(device)
-            filter_bias = data["filter_bias"].to(device)
-            mode = data["mode"]
-
-            if mode == "head-batch" or mode == "tail-batch":
-
-                score = model(sample=sample, negative_sample=negative_sample, mode=mode)
-
-            elif mode == "relation-batch":
-
-                score = model(negative_sample)
-
-            score += filter_bias
-
-            argsort = torch.argsort(score, dim=1, descending=True)
-
-            if mode == "head-batch":
-                positive_arg = sample[:, 0]
-
-            if mode == "relation-batch":
-                positive_arg = sample[:, 1]
-
-            elif mode == "tail-batch":
-                positive_arg = sample[:, 2]
-
-            batch_size = sample.size(0)
-
-            for i in range(batch_size):
-                # Notice that argsort is not ranking
-                ranking = torch.nonzero(argsort[i, :] == positive_arg[i])[:1]
-                assert ranking.size(0) == 1
-
-                ranking = 1 + ranking.item()
-
-                # ranking + 1 is the true ranking used in evaluation metrics
-                metrics["MRR"].update(1.0 / ranking)
-
-                metrics["MR"].update(ranking)
-
-                metrics["HITS@1"].update(1.0 if ranking <= 1 else 0.0)
-
-                metrics["HITS@3"].update(1.0 if ranking <= 3 else 0.0)
-
-                metrics["HITS@10"].update(1.0 if ranking <= 10 else 0.0)
-
-        if training:
-            model = model.train()
-
-        return metrics
-
-    def compute_detailled_score(self, model, test_set, metrics, types_relations, device):
-
-        training = False
-        if model.training:
-            model = model.eval()
-            training = True
-
-        bar = Bar(dataset=test_set, update_every=1)
-        bar.set_description("Evaluation")
-
-        for data in bar:
-
-            sample = data["sample"].to(device)
-            negative_sample = data["negative_sample"].to(device)
-            filter_bias = data["filter_bias"].to(device)
-            mode = data["mode"]
-
-            score = model(
-                sample=sample,
-                negative_sample=negative_sample,
-                mode=mode,
-            )
-
-            score += filter_bias
-
-            argsort = torch.argsort(score, dim=1, descending=True)
-
-            if mode == "head-batch":
-                positive_arg = sample[:, 0]
-
-            elif mode == "tail-batch":
-                positive_arg = sample[:, 2]
-
-            batch_size = sample.size(0)
-
-            for i in range(batch_size):
-                # Notice that argsort is not ranking
-                ranking = torch.nonzero(argsort[i, :] == positive_arg[i])[:1]
-                assert ranking.size(0) == 1
-
-                ranking = 1 + ranking.item()
-
-                type_relation = types_relations[sample[:, 1][i].item()]
-
-                # ranking + 1 is the true ranking used in evaluation metrics
-                metrics[mode][type_relation]["MRR"].update(1.0 / ranking)
-
-                metrics[mode][type_relation]["MR"].update(ranking)
-
-                metrics[mode][type_relation]["HITS@1"].update(1.0 if ranking <= 1 else 0.0)
-
-                metrics[mode][type_relation]["HITS@3"].update(1.0 if ranking <= 3 else 0.0)
-
-                metrics[mode][type_relation]["HITS@10"].update(1.0 if ranking <= 10 else 0.0)
-
-        if training:
-            model = model.train()
-
-        return metrics
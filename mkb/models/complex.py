@@ -1,5 +1,8 @@
+import functools
+
 import torch
 
+from ..utils import complex_operands, complex_product
 from .base import BaseModel
 
 __all__ = ["ComplEx"]
@@ -14,6 +17,19 @@ class ComplEx(BaseModel):
         n_relation (int): Number of relations to consider.
         gamma (float): A higher gamma parameter increases the upper and lower bounds of the latent
             space and vice-versa.
+        interleaved (bool): Store the real and imaginary parts of embeddings as interleaved pairs
+            [re_0, im_0, re_1, im_1, ...] rather than as two halves [re_0, re_1, ..., im_0, im_1,
+            ...]. Interleaved embeddings are viewed as complex tensors and scored with complex
+            kernels. Defaults to False to stay compatible with existing checkpoints, which can be
+            migrated with the interleave method.
+        amp_dtype (torch.dtype): Precision used to score triplets, i.e. torch.bfloat16 or
+            torch.float16 to halve the memory traffic on GPU. Matrix products accumulate in float32
+            and scores are returned as float32. Only used with the split layout. Defaults to
+            torch.float32.
+        compiled (bool): Score triplets with a torch.compile version of the scoring function.
+            Graphs are specialized for each mode and each shape of batch. The first batches are
+            slower as they trigger the compilation. Only used with the split layout. Defaults to
+            False.
 
     Example:
 
@@ -46,13 +62,50 @@ class ComplEx(BaseModel):
         >>> model.embeddings['relations']['locatedin']
         tensor([ 0.4710, -0.9410,  0.3869,  0.4595,  0.6451, -0.5734])
 
+        >>> sample = torch.tensor([[0, 0, 1], [2, 1, 3]])
+        >>> negative_sample = torch.tensor([[4, 5, 6], [7, 8, 9]])
+
+        >>> score = model(sample, negative_sample, mode='tail-batch')
+
+        >>> model.amp_dtype = torch.bfloat16
+        >>> score_bf16 = model(sample, negative_sample, mode='tail-batch')
+        >>> score_bf16.dtype
+        torch.float32
+
+        >>> torch.allclose(score, score_bf16, atol=1e-2)
+        True
+
+        >>> model.amp_dtype = torch.float32
+
+        >>> model = model.interleave()
+
+        >>> model.embeddings['entities']['oceania']
+        tensor([ 0.8911, -0.1209, -0.7287,  0.9779, -0.1702, -0.2161])
+
+        >>> torch.allclose(score, model(sample, negative_sample, mode='tail-batch'))
+        True
+
     References:
         1. [Trouillon, Théo, et al. "Complex embeddings for simple link prediction." International Conference on Machine Learning (ICML), 2016.](http://proceedings.mlr.press/v48/trouillon16.pdf)
         2. [Knowledge Graph Embedding](https://github.com/DeepGraphLearning/KnowledgeGraphEmbedding)
 
     """
 
-    def __init__(self, hidden_dim, entities, relations, gamma):
+    # Defaults of models pickled before these options were introduced.
+    interleaved = False
+    amp_dtype = torch.float32
+    compiled = False
+
+    def __init__(
+        self,
+        hidden_dim,
+        entities,
+        relations,
+        gamma,
+        interleaved=False,
+        amp_dtype=torch.float32,
+        compiled=False,
+    ):
         super().__init__(
             hidden_dim=hidden_dim,
             relation_dim=hidden_dim * 2,
@@ -61,25 +114,59 @@ class ComplEx(BaseModel):
             relations=relations,
             gamma=gamma,
         )
+        self.interleaved = interleaved
+        self.amp_dtype = amp_dtype
+        self.compiled = compiled
 
     def forward(self, sample, negative_sample=None, mode=None):
         head, relation, tail, shape = self.batch(
             sample=sample, negative_sample=negative_sample, mode=mode
         )
 
-        re_head, im_head = torch.chunk(head, 2, dim=2)
-        re_relation, im_relation = torch.chunk(relation, 2, dim=2)
-        re_tail, im_tail = torch.chunk(tail, 2, dim=2)
+        if self.interleaved:
+            score = self._complex_score(head=head, relation=relation, tail=tail, mode=mode)
+            return score.view(shape)
 
-        if mode == "head-batch":
-            re_score = re_relation * re_tail + im_relation * im_tail
-            im_score = re_relation * im_tail - im_relation * re_tail
-            score = re_head * re_score + im_head * im_score
+        if self.amp_dtype != torch.float32:
+            head, relation, tail = (x.to(self.amp_dtype) for x in (head, relation, tail))
 
-        else:
-            re_score = re_head * re_relation - im_head * im_relation
-            im_score = re_head * im_relation + im_head * re_relation
-            score = re_score * re_tail + im_score * im_tail
+        # Scores are the real part of <entity, relation, query> where the relation is first
+        # combined with the entity which is not corrupted, the product is then contracted with the
+        # remaining entity in a single einsum call.
+        entity, query, conjugate = complex_operands(head=head, tail=tail, mode=mode)
+
+        product = _compiled_product() if self.compiled else complex_product
+        score = product(entity, relation, query, conjugate)
+        return score.float().view(shape)
 
-        score = score.sum(dim=2)
-        return score.view(shape)
+    @staticmethod
+    def _complex_score(head, relation, tail, mode):
+        """Score interleaved embeddings viewed as complex tensors."""
+        head, relation, tail = (
+            torch.view_as_complex(x.reshape(*x.shape[:-1], -1, 2)) for x in (head, relation, tail)
+        )
+
+        if mode == "head-batch":
+            entity, query = head, relation * tail.conj()
+        else:
+            entity, query = tail.conj(), head * relation
+
+        entity, query = torch.broadcast_tensors(entity, query)
+        return torch.einsum("bnd,bnd->bn", entity, query).real
+
+    def interleave(self):
+        """Convert embeddings stored as real and imaginary halves into interleaved pairs. Allows to
+        load a checkpoint trained with interleaved set to False into the interleaved layout."""
+        if not self.interleaved:
+            for embedding in (self.entity_embedding, self.relation_embedding):
+                real, imaginary = embedding.data.chunk(2, dim=1)
+                embedding.data = torch.stack([real, imaginary], dim=2).flatten(1)
+            self.interleaved = True
+        return self
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_product():
+    """Compile the scoring function once per process. The conjugate argument is a constant of the
+    graph, so head-batch and tail-batch get their own specialized graph."""
+    return torch.compile(complex_product, dynamic=False)
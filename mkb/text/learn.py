@@ -5,7 +5,6 @@ import collections
 
 import torch
 from mkb import utils
-from river import stats
 
 from ..sampling import positive_triples
 
@@ -141,7 +140,7 @@ def learn(
         HITS@10_relations: 1.0
 
     """
-    metric_loss = stats.RollingMean(1000)
+    metric_loss = utils.RollingMean(1000)
     round_without_improvement_valid, round_without_improvement_test = 0, 0
     history_valid, history_test = collections.defaultdict(float), collections.defaultdict(float)
     valid_scores, test_scores = {}, {}
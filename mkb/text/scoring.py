@@ -4,6 +4,8 @@ from math import pi
 
 import torch
 
+from ..utils import complex_operands, complex_product
+
 
 class Scoring:
     def __init__(self):
@@ -218,18 +220,6 @@ class ComplEx(Scoring):
             head-batch or tail-batch.
 
         """
-        re_head, im_head = torch.chunk(head, 2, dim=2)
-        re_relation, im_relation = torch.chunk(relation, 2, dim=2)
-        re_tail, im_tail = torch.chunk(tail, 2, dim=2)
-
-        if mode == "head-batch":
-            re_score = re_relation * re_tail + im_relation * im_tail
-            im_score = re_relation * im_tail - im_relation * re_tail
-            score = re_head * re_score + im_head * im_score
-
-        else:
-            re_score = re_head * re_relation - im_head * im_relation
-            im_score = re_head * im_relation + im_head * re_relation
-            score = re_score * re_tail + im_score * im_tail
+        entity, query, conjugate = complex_operands(head=head, tail=tail, mode=mode)
+        return complex_product(entity, relation, query, conjugate)
 
-        return score.sum(dim=2)
@@ -1,15 +1,19 @@
 from .bar import Bar
 from .bar import BarRange
+from .complex_product import complex_operands
+from .complex_product import complex_product
 from .dataframe_to_kg import dataframe_to_kg
 from .dataframe_to_kg import map_embeddings
 from .dataframe_to_kg import decompose
 from .dataframe_to_kg import row_embeddings
 from .export_embeddings import export_embeddings
+from .load_dataset_bundle import load_dataset_bundle
 from .predict import FetchToPredict
 from .predict import make_prediction
 from .read_csv import read_csv
 from .read_csv import read_csv_classification
 from .read_json import read_json
+from .rolling_mean import RollingMean
 from .scores_to_csv import ScoresToCsv
 from .top_k import TopK
 from .unaligne import Unaligne
@@ -18,16 +22,20 @@ from .unaligne import Unaligne
 __all__ = [
     "Bar",
     "BarRange",
+    "complex_operands",
+    "complex_product",
     "dataframe_to_kg",
     "map_embeddings",
     "decompose",
     "row_embeddings",
     "export_embeddings",
+    "load_dataset_bundle",
     "FetchToPredict",
     "make_prediction",
     "read_csv",
     "read_csv_classification",
     "read_json",
+    "RollingMean",
     "ScoresToCsv",
     "TopK",
     "Unaligne",
@@ -23,16 +23,21 @@ class Bar:
         self.bar = tqdm.tqdm(
             dataset,
             position=position,
+            mininterval=0.5,
+            smoothing=0,
         )
         self.update_every = update_every
         self.n = 0
+        self.description = None
 
     def __iter__(self, loss=None):
         yield from self.bar
 
     def set_description(self, text):
-        if self.n % self.update_every == 0:
-            self.bar.set_description(text)
+        # The description is displayed at the next refresh of the bar, throttled by tqdm.
+        if self.n % self.update_every == 0 and text != self.description:
+            self.bar.set_description(text, refresh=False)
+            self.description = text
         self.n += 1
 
 
@@ -56,14 +61,19 @@ class BarRange:
         self.bar = tqdm.tqdm(
             range(step),
             position=position,
+            mininterval=0.5,
+            smoothing=0,
         )
         self.update_every = update_every
         self.n = 0
+        self.description = None
 
     def __iter__(self, loss=None):
         yield from self.bar
 
     def set_description(self, text):
-        if self.n % self.update_every == 0:
-            self.bar.set_description(text)
+        # The description is displayed at the next refresh of the bar, throttled by tqdm.
+        if self.n % self.update_every == 0 and text != self.description:
+            self.bar.set_description(text, refresh=False)
+            self.description = text
         self.n += 1
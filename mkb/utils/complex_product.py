@@ -0,0 +1,69 @@
+import torch
+
+__all__ = ["complex_operands", "complex_product"]
+
+
+def complex_operands(head, tail, mode):
+    """Select the operands of complex_product. Head-batch scores are rewritten as the real part of
+    <head, relation, conj(tail)> so that both modes share the same computation.
+
+    Parameters:
+        head (torch.Tensor): Embeddings of heads.
+        tail (torch.Tensor): Embeddings of tails.
+        mode (str): head-batch or tail-batch.
+
+    Returns the entity contracted last, the query combined with the relation and the factor of
+    the imaginary part of the query.
+
+    """
+    return (head, tail, -1.0) if mode == "head-batch" else (tail, head, 1.0)
+
+
+def complex_product(entity, relation, query, conjugate: float):
+    """Real part of <entity, relation, query> with embeddings of shape (batch, n, 2 * dim) stored as
+    real and imaginary halves. The imaginary part of the query is multiplied by conjugate. Used by
+    the ComplEx model and the ComplEx scoring of text models.
+
+    Parameters:
+        entity (torch.Tensor): Embeddings contracted with the product of the relation and the query.
+        relation (torch.Tensor): Embeddings of relations.
+        query (torch.Tensor): Embeddings combined with the relations.
+        conjugate (float): 1.0 or -1.0 to use the conjugate of the query.
+
+    Example:
+
+        >>> from mkb import utils
+        >>> import torch
+
+        >>> _ = torch.manual_seed(42)
+
+        >>> head, relation = torch.randn(2, 1, 4), torch.randn(2, 1, 4)
+        >>> tail = torch.randn(2, 3, 4)
+
+        >>> h = torch.complex(head[..., :2], head[..., 2:])
+        >>> r = torch.complex(relation[..., :2], relation[..., 2:])
+        >>> t = torch.complex(tail[..., :2], tail[..., 2:])
+
+        >>> entity, query, conjugate = utils.complex_operands(head, tail, mode="tail-batch")
+        >>> score = utils.complex_product(entity, relation, query, conjugate)
+
+        >>> score.shape
+        torch.Size([2, 3])
+
+        >>> torch.allclose(score, (h * r * t.conj()).real.sum(dim=2), atol=1e-6)
+        True
+
+    """
+    dim = relation.size(2) // 2
+    re_relation, im_relation = relation[..., :dim], relation[..., dim:]
+    re_query, im_query = query[..., :dim], query[..., dim:]
+    im_query = conjugate * im_query
+
+    re_score = re_relation * re_query - im_relation * im_query
+    im_score = conjugate * (re_relation * im_query + im_relation * re_query)
+
+    # Operands are expanded to the same shape, einsum does not broadcast on older versions of
+    # torch. Expanded tensors are views, nothing is copied.
+    entity, product = torch.broadcast_tensors(entity, torch.cat([re_score, im_score], dim=2))
+
+    return torch.einsum("bnd,bnd->bn", entity, product)
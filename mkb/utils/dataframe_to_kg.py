@@ -1,3 +1,6 @@
+import itertools
+
+import numpy as np
 import pandas as pd
 
 from sklearn import decomposition
@@ -49,21 +52,20 @@ def dataframe_to_kg(df, keys, prefix={}):
 
         for tail in tails:
 
-            subset = df[[head, tail]].drop_duplicates().copy(deep=True)
+            subset = df[[head, tail]].drop_duplicates()
+
+            heads, tails_ = subset[head], subset[tail]
 
             # Add prefix to avoid collisions:
             if head in prefix:
-                subset[head] = prefix[head] + subset[head].astype('str')
+                heads = prefix[head] + heads.astype('str')
 
             if tail in prefix:
-                subset[tail] = prefix[tail] + subset[tail].astype('str')
+                tails_ = prefix[tail] + tails_.astype('str')
 
-            subset.columns = ['head', 'tail']
-            subset['relation'] = f'{head}_{tail}'
+            relation = f'{head}_{tail}'
 
-            kg = kg + \
-                list(subset[['head', 'relation', 'tail']
-                            ].to_records(index=False))
+            kg.extend(zip(heads.tolist(), itertools.repeat(relation, len(heads)), tails_.tolist()))
 
     return kg
 
@@ -73,93 +75,96 @@ def map_embeddings(df, prefix, embeddings, n_components, batch_size=None):
     embeddings. If batch size is defined, apply incremental PCA.
     """
 
-    df_embeddings = df.copy()
+    labels, X = _fit_transform(
+        embeddings=embeddings, n_components=n_components, batch_size=batch_size)
 
-    embeddings = decompose(embeddings=embeddings,
-                           n_components=n_components, batch_size=batch_size)
+    matrix = _with_missing_row(X)
 
-    for column, prefix in prefix.items():
-
-        df_embeddings[column] = prefix + df_embeddings[column].astype(str)
+    columns = []
 
     for column in df.columns:
 
-        df_embeddings[column] = df_embeddings[column].map(embeddings)
+        columns.append(pd.DataFrame(
+            matrix[_positions(df[column], labels, prefix.get(column), as_str=column in prefix)],
+            index=df.index,
+            columns=[f'{column}_dim_{i}' for i in range(n_components)],
+        ))
 
-    columns_to_keep = []
+    return pd.concat(columns, axis='columns')
 
-    for column in df.columns:
 
-        for i in range(n_components):
+def _positions(values, labels, prefix=None, as_str=True):
+    """Position of the label of each value within labels, -1 when the label is missing. Labels are
+    built once per distinct value rather than once per row."""
+    uniques = values.drop_duplicates()
 
-            df_embeddings[f'{column}_dim_{i}'] = df_embeddings[column].str[i]
+    # Position of the distinct value of each row.
+    codes = pd.Index(uniques).get_indexer(values)
 
-            columns_to_keep.append(f'{column}_dim_{i}')
+    if as_str:
+        uniques = uniques.astype(str)
 
-    return df_embeddings[columns_to_keep]
+    if prefix is not None:
+        uniques = prefix + uniques
 
+    return labels.get_indexer(uniques)[codes]
 
-def decompose(embeddings, n_components, batch_size=None):
-    """Apply CPA over input dataset. If batch size is not None, use incremental PCA."""
 
-    embeddings = pd.DataFrame(embeddings).T.reset_index()
+def _with_missing_row(X):
+    """Append a row of NaN to a matrix, position -1 is dedicated to missing labels."""
+    return np.vstack([X, np.full((1, X.shape[1]), np.nan)])
 
-    embeddings = embeddings.set_index('index')
 
-    if batch_size is None:
-        PCA = decomposition.PCA(n_components=n_components)
+def decompose(embeddings, n_components, batch_size=None):
+    """Apply CPA over input dataset. If batch size is not None, use incremental PCA. Large inputs
+    are decomposed with a randomized SVD."""
 
-    else:
-        PCA = decomposition.IncrementalPCA(
-            n_components=n_components, batch_size=batch_size)
+    labels, X = _fit_transform(
+        embeddings=embeddings, n_components=n_components, batch_size=batch_size)
 
-    X = PCA.fit_transform(embeddings)
+    # Rows of a C-contiguous matrix are contiguous views.
+    return dict(zip(labels, np.ascontiguousarray(X)))
 
-    output = {}
 
-    for i, label in enumerate(embeddings.index):
+def _fit_transform(embeddings, n_components, batch_size=None):
+    """Stack embeddings as a matrix and reduce it. Returns the index of labels and the matrix."""
 
-        output[label] = X[i]
+    labels = list(embeddings)
 
-    return output
+    X = np.stack([np.asarray(embeddings[label]) for label in labels])
 
+    X = _pca(n_components=n_components, batch_size=batch_size, size=X.size).fit_transform(X)
 
-def row_embeddings(df, embeddings, prefix, n_components=2, batch_size=None):
-    """Map embeddings on input dataframe and apply PCA on the input dataframe. Apply PCA after mapping
-    embeddings.
-    """
-    e = {}
-    for key, value in embeddings.items():
-        e[key] = value.tolist()
+    return pd.Index(labels, dtype=object), X
 
-    X = []
 
-    for column in df.columns:
+def _pca(n_components, batch_size=None, size=0):
+    """Select the PCA dedicated to a matrix of the given size. Randomized SVD has a cost linear in
+    the number of components while exact SVD is quadratic in the number of features."""
+
+    if batch_size is not None:
+        return decomposition.IncrementalPCA(n_components=n_components, batch_size=batch_size)
 
-        if column in prefix:
-            embedding = (prefix[column] +
-                         df[column].astype(str)).map(e)
-        else:
-            embedding = df[column].astype(str).map(e)
+    if size > 1e7:
+        return decomposition.PCA(
+            n_components=n_components, svd_solver='randomized', iterated_power=5, random_state=0)
 
-        X.append(
-            pd.DataFrame(dict(zip(df.index, embedding))).T
-        )
+    return decomposition.PCA(n_components=n_components)
 
-    X = pd.concat(X, axis='columns')
 
-    if batch_size is None:
-        PCA = decomposition.PCA(n_components=n_components)
-    else:
-        PCA = decomposition.IncrementalPCA(
-            n_components=n_components, batch_size=batch_size)
+def row_embeddings(df, embeddings, prefix, n_components=2, batch_size=None):
+    """Map embeddings on input dataframe and apply PCA on the input dataframe. Apply PCA after mapping
+    embeddings.
+    """
+    labels = pd.Index(list(embeddings), dtype=object)
 
-    X = PCA.fit_transform(X)
+    matrix = _with_missing_row(
+        np.stack([np.asarray(embeddings[label], dtype=np.float64) for label in labels]))
 
-    X = pd.DataFrame(X)
+    X = [matrix[_positions(df[column], labels, prefix.get(column))] for column in df.columns]
 
-    X.columns = [f'dim_{i}' for i in range(len(X.columns))]
+    X = np.hstack(X)
 
-    X.index = df.index
+    X = _pca(n_components=n_components, batch_size=batch_size, size=X.size).fit_transform(X)
 
-    return X
+    return pd.DataFrame(X, index=df.index, columns=[f'dim_{i}' for i in range(X.shape[1])])
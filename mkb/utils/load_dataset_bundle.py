@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from .read_csv import read_csv, read_csv_classification
+from .read_json import read_json
+
+__all__ = ["load_dataset_bundle"]
+
+
+def load_dataset_bundle(path, classification=True, max_workers=6, cache=False):
+    """Load the files of a dataset stored in a folder. Files are read concurrently with a thread
+    pool, one task per file.
+
+    Parameters:
+        path (str): Folder which stores train.csv, valid.csv, test.csv, entities.json and
+            relations.json.
+        classification (bool): Also load classification_valid.csv and classification_test.csv.
+        max_workers (int): Number of threads dedicated to read the files.
+        cache (bool): Store parsed csv files as NumPy files next to them, see read_csv.
+
+    Example:
+
+        >>> import pathlib
+
+        >>> from mkb import datasets
+        >>> from mkb import utils
+
+        >>> path = pathlib.Path(datasets.__file__).parent.joinpath("nations")
+
+        >>> bundle = utils.load_dataset_bundle(path)
+
+        >>> for key, value in bundle.items():
+        ...     print(key, len(value))
+        train 1619
+        valid 202
+        test 203
+        entities 14
+        relations 56
+        classification_valid 2
+        classification_test 2
+
+        >>> sorted(utils.load_dataset_bundle(path, classification=False))
+        ['entities', 'relations', 'test', 'train', 'valid']
+
+    """
+    readers = {
+        "train": (read_csv, f"{path}/train.csv", cache),
+        "valid": (read_csv, f"{path}/valid.csv", cache),
+        "test": (read_csv, f"{path}/test.csv", cache),
+        "entities": (read_json, f"{path}/entities.json"),
+        "relations": (read_json, f"{path}/relations.json"),
+    }
+
+    if classification:
+        readers["classification_valid"] = (
+            read_csv_classification,
+            f"{path}/classification_valid.csv",
+            cache,
+        )
+        readers["classification_test"] = (
+            read_csv_classification,
+            f"{path}/classification_test.csv",
+            cache,
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {key: executor.submit(*reader) for key, reader in readers.items()}
+        return {key: future.result() for key, future in futures.items()}
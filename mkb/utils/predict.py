@@ -33,12 +33,12 @@ class FetchToPredict(Dataset):
     """
 
     def __init__(self, dataset, batch_size, num_workers=1):
-        self.dataset = dataset
+        self.dataset = torch.LongTensor(dataset)
         self.batch_size = batch_size
         self.num_workers = num_workers
 
     def __getitem__(self, idx):
-        return torch.LongTensor(self.dataset[idx])
+        return self.dataset[idx]
 
     def __len__(self):
         return len(self.dataset)
@@ -97,10 +97,17 @@ def make_prediction(model, dataset, batch_size, num_workers=1, device='cuda'):
     """
     with torch.no_grad():
 
-        y_pred = []
+        # Scores are written in a single buffer allocated on the device.
+        y_pred = torch.empty(len(dataset), device=device)
+
+        start = 0
 
         for x in FetchToPredict(dataset=dataset, batch_size=batch_size, num_workers=num_workers):
 
-            y_pred.append(model(x.to(device)))
+            end = start + x.size(0)
+
+            y_pred[start:end] = model(x.to(device, non_blocking=True)).flatten()
+
+            start = end
 
-        return torch.cat(y_pred).flatten()
+        return y_pred
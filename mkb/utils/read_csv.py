@@ -1,11 +1,13 @@
-import csv
+import functools
+import os
 
+import numpy as np
 import pandas as pd
 
 __all__ = ["read_csv", "read_csv_classification"]
 
 
-def read_csv(file_path):
+def read_csv(file_path, cache=False):
     """Read csv file composed of triplets and convert it as list of tuples.
 
     [
@@ -14,18 +16,81 @@ def read_csv(file_path):
         [e_n, r_n, e_p],
     ]
 
+    Triplets are kept in memory so that datasets loaded multiple times within the same process do
+    not read the file again. When cache is True, parsed triplets are also stored as a NumPy file
+    next to the csv file so that the csv file is parsed only once across processes.
+
+    Parameters:
+        file_path (str): Path of the csv file.
+        cache (bool): Store parsed triplets in a {file_path}.npz file.
+
     """
-    with open(f"{file_path}", "r") as csv_file:
-        return [
-            (int(head), int(relation), int(tail)) for head, relation, tail in csv.reader(csv_file)
-        ]
+    return list(_read_triples(str(file_path), _signature(file_path), cache))
 
 
-def read_csv_classification(path):
+def read_csv_classification(path, cache=False):
     """Read triplets dedicated to classification. Released by NTN (Socher et al. 2013)."""
-    df = pd.read_csv(path, header=None)
-    df.columns = ["head", "relation", "tail", "label"]
+    values = _read_classification(str(path), _signature(path), cache)
+
     return {
-        "X": df[["head", "relation", "tail"]].values.tolist(),
-        "y": df["label"].values.tolist(),
+        "X": values[:, :3].tolist(),
+        "y": values[:, 3].tolist(),
     }
+
+
+def _signature(file_path):
+    """Size and modification time of a file, both are checked to detect an updated file."""
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+@functools.lru_cache(maxsize=32)
+def _read_triples(file_path, signature, cache):
+    """Triplets of a csv file as an immutable tuple. The signature of the file is part of the key
+    of the in-memory cache."""
+    return tuple(zip(*_parse(file_path, signature, cache).T.tolist()))
+
+
+@functools.lru_cache(maxsize=32)
+def _read_classification(file_path, signature, cache):
+    """Read-only array of a classification csv file. The signature of the file is part of the key
+    of the in-memory cache."""
+    values = _parse(file_path, signature, cache)
+    values.flags.writeable = False
+    return values
+
+
+def _parse(file_path, signature, cache):
+    """Parse a csv file of integers, the parsed array is optionally cached next to the file."""
+    array = _load_cache(file_path, signature) if cache else None
+
+    if array is None:
+        array = pd.read_csv(file_path, header=None, dtype=np.int64, engine="c").to_numpy()
+        if cache:
+            _dump_cache(file_path, signature, array)
+
+    return array
+
+
+def _load_cache(file_path, signature):
+    """Load the cached array of a csv file if it has been built from the same file. The size and
+    the modification time of the source file are stored within the cache."""
+    try:
+        with np.load(f"{file_path}.npz", allow_pickle=False) as cache:
+            if tuple(cache["signature"].tolist()) == signature:
+                return cache["array"]
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+
+def _dump_cache(file_path, signature, array):
+    """Cache the array parsed from a csv file. The cache is skipped if the folder is read-only."""
+    cache = f"{file_path}.npz"
+    tmp = f"{cache}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as output:
+            np.savez(output, array=array, signature=np.array(signature, dtype=np.int64))
+        os.replace(tmp, cache)
+    except OSError:
+        pass
@@ -1,8 +1,31 @@
-import json
+import functools
+import os
+import pathlib
+
+try:
+    import orjson as json
+except ImportError:
+    try:
+        import ujson as json
+    except ImportError:
+        import json
 
 __all__ = ['read_json']
 
 
 def read_json(file_path):
-    """Read entities and relations json."""
-    return json.loads(open(file_path).read())
+    """Read entities and relations json.
+
+    orjson or ujson are used to parse the file when installed. The parsed dictionary is kept in
+    memory, a copy is returned on each call.
+
+    """
+    stat = os.stat(file_path)
+    return dict(_read_json(str(file_path), stat.st_size, stat.st_mtime_ns))
+
+
+@functools.lru_cache(maxsize=32)
+def _read_json(file_path, size, mtime_ns):
+    """Parse a json file. The size and the modification time of the file are part of the key of the
+    cache."""
+    return json.loads(pathlib.Path(file_path).read_bytes())
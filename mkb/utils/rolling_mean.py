@@ -0,0 +1,37 @@
+import collections
+
+__all__ = ['RollingMean']
+
+
+class RollingMean:
+    """Running average over a window of the most recent values.
+
+    Parameters:
+        window_size (int): Number of values to average.
+
+    Example:
+
+        >>> from mkb import utils
+
+        >>> mean = utils.RollingMean(window_size=2)
+
+        >>> for x in [1, 2, 3]:
+        ...     mean.update(x)
+
+        >>> mean.get()
+        2.5
+
+    """
+
+    def __init__(self, window_size):
+        self.window = collections.deque(maxlen=window_size)
+        self.sum = 0.0
+
+    def update(self, x):
+        if len(self.window) == self.window.maxlen:
+            self.sum -= self.window[0]
+        self.window.append(x)
+        self.sum += x
+
+    def get(self):
+        return self.sum / len(self.window) if self.window else 0.0
@@ -227,8 +227,5 @@ class TopK:
     @classmethod
     def _get_rank(cls, model, sample, k, device):
         with torch.no_grad():
-            return torch.argsort(
-                model(sample.to(device)),
-                descending=True,
-                dim=0
-            ).flatten()[:k]
+            score = model(sample.to(device)).flatten()
+            return torch.topk(score, k=min(k, score.size(0))).indices
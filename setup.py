@@ -19,6 +19,7 @@ setuptools.setup(
     url="https://github.com/raphaelsty/mkb",
     packages=setuptools.find_packages(),
     install_requires=required,
+    extras_require={"json": ["orjson"]},
     package_data={
         "mkb": [
             "datasets/countries_s1/*.csv",